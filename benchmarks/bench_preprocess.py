@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for audio preprocessing, per format in SUPPORTED_AUDIO_FORMATS.
+
+Compares the in-process kernel (pink_transcriber.core.audio decode +
+resample) with NeMo's AudioSegment loader - or librosa.load if NeMo isn't
+installed - on synthetic clips at several rates/channel counts. The last
+column shows which of the two model.transcribe uses for that input.
+
+    python benchmarks/bench_preprocess.py [--duration 30] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from pink_transcriber.cli.replay import SYNTH_FORMATS, synthesize_audio
+from pink_transcriber.config import SUPPORTED_AUDIO_FORMATS
+from pink_transcriber.core import audio
+
+# (sample_rate, channels) variants: fast path, typical recorder output, stereo call
+VARIANTS = [(16000, 1), (48000, 1), (44100, 2)]
+
+
+def _baseline_loader() -> tuple[str, Callable[[str], Any]]:
+    """Current decode path: NeMo's loader if available, else librosa."""
+    try:
+        from nemo.collections.asr.parts.preprocessing.segment import AudioSegment
+
+        def load(path: str) -> Any:
+            return AudioSegment.from_file(path, target_sr=audio.MODEL_SAMPLE_RATE).samples
+
+        return 'nemo', load
+    except ImportError:
+        import librosa
+
+        def load(path: str) -> Any:
+            return librosa.load(path, sr=audio.MODEL_SAMPLE_RATE, mono=True)[0]
+
+        return 'librosa', load
+
+
+def _kernel(path: str) -> Any:
+    samples, sample_rate = audio.decode(path, mono=True)
+    return audio.resample(samples, sample_rate)
+
+
+def _time(fn: Callable[[str], Any], path: str, repeat: int) -> Optional[float]:
+    """Median wall time in ms (after one warm-up call), or None if fn fails."""
+    try:
+        fn(path)
+    except Exception:
+        return None
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _fmt_ms(value: Optional[float]) -> str:
+    return f"{value:10.1f}" if value is not None else f"{'n/a':>10}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark audio preprocessing per format')
+    parser.add_argument('--duration', type=float, default=30.0, help='Clip length in seconds (default: 30)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case (default: 5)')
+    args = parser.parse_args()
+
+    baseline_name, baseline = _baseline_loader()
+
+    print(f"{args.duration:.0f}s clips, median of {args.repeat} runs (ms)")
+    print(f"{'format':8}{'rate':>7}{'ch':>4}{baseline_name:>10}{'kernel':>10}{'speedup':>9}{'served by':>11}")
+
+    with tempfile.TemporaryDirectory(prefix='pink-bench-') as workdir:
+        for fmt in sorted(SUPPORTED_AUDIO_FORMATS):
+            if fmt not in SYNTH_FORMATS:
+                print(f"{fmt:8}  (skipped: libsndfile can't encode, decoded via fallback)")
+                continue
+
+            for sample_rate, channels in VARIANTS:
+                path = synthesize_audio(
+                    Path(workdir) / f"{fmt[1:]}-{sample_rate}-{channels}",
+                    args.duration,
+                    fmt,
+                    sample_rate=sample_rate,
+                    channels=channels,
+                )
+                actual_rate = audio.decode(str(path))[1]
+
+                before = _time(baseline, str(path), args.repeat)
+                after = _time(_kernel, str(path), args.repeat)
+                speedup = f"{before / after:8.1f}x" if before and after else f"{'':>9}"
+                served_by = 'kernel' if audio.load_audio(str(path)) is not None else baseline_name
+
+                print(
+                    f"{fmt:8}{actual_rate:7d}{channels:4d}{_fmt_ms(before)}{_fmt_ms(after)}"
+                    f"{speedup}{served_by:>11}"
+                )
+
+
+if __name__ == "__main__":
+    main()
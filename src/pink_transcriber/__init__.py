@@ -1,3 +1,17 @@
 """Pink Transcriber - High-performance voice transcription service for macOS."""
 
 __version__ = "1.0.0"
+
+from pink_transcriber.client import (
+    AsyncPinkClient,
+    PinkClient,
+    ServerNotRunningError,
+    TranscriptionError,
+)
+
+__all__ = [
+    "AsyncPinkClient",
+    "PinkClient",
+    "ServerNotRunningError",
+    "TranscriptionError",
+]
@@ -9,10 +9,11 @@ from __future__ import annotations
 import argparse
 import os
 import sys
-import socket
 from pathlib import Path
+from typing import Any
 
 from pink_transcriber import __version__
+from pink_transcriber.client import PinkClient
 from pink_transcriber.config import SUPPORTED_AUDIO_FORMATS, SOCKET_PATH
 
 
@@ -34,35 +35,26 @@ def validate_audio_file(file_path: str) -> None:
         sys.exit(1)
 
 
-def transcribe(socket_path: Path, audio_path: str) -> str:
+def transcribe(socket_path: Path, audio_path: str, **options: Any) -> str:
     """Send audio file to server and receive transcription."""
-    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # No read timeout: long files can sit behind a busy queue
+    with PinkClient(socket_path, max_connections=1, timeout=None, **options) as client:
+        return client.transcribe(audio_path)
 
-    try:
-        sock.connect(str(socket_path))
-
-        # Send audio path
-        sock.sendall(audio_path.encode() + b'\n')
-
-        # Receive transcription result
-        response = b''
-        while True:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            response += chunk
-            if response.endswith(b'\n'):
-                break
 
-        text = response.decode().strip()
+def transcribe_channels(socket_path: Path, audio_path: str, **options: Any) -> str:
+    """Transcribe each channel separately, return segments interleaved by time."""
+    with PinkClient(socket_path, max_connections=1, timeout=None, **options) as client:
+        result = client.transcribe_channels(audio_path)
 
-        if text.startswith("ERROR:"):
-            raise RuntimeError(text[7:])
+    if not result['segments']:
+        return '\n'.join(f"ch{c['channel']}: {c['text']}" for c in result['channels'])
 
-        return text
-
-    finally:
-        sock.close()
+    lines = []
+    for segment in result['segments']:
+        minutes, seconds = divmod(segment['start'], 60)
+        lines.append(f"[{int(minutes):02d}:{seconds:05.2f}] ch{segment['channel']}: {segment['text']}")
+    return '\n'.join(lines)
 
 
 def main() -> None:
@@ -83,11 +75,34 @@ def main() -> None:
         action='version',
         version=f'%(prog)s {__version__}'
     )
+    parser.add_argument(
+        '--channels',
+        action='store_true',
+        help='Transcribe each channel separately (e.g. stereo call recordings)'
+    )
     parser.add_argument(
         '--health',
         action='store_true',
         help='Check if transcription server is running'
     )
+    parser.add_argument(
+        '--spawn',
+        action='store_true',
+        help='Start the server in the background if it is not running'
+    )
+    parser.add_argument(
+        '--idle-exit',
+        type=float,
+        default=None,
+        metavar='SECONDS',
+        help='With --spawn: server exits after this many idle seconds'
+    )
+    parser.add_argument(
+        '--reload',
+        nargs='*',
+        metavar=('MODEL', 'DEVICE'),
+        help='Hot-reload server model (optionally a different model and/or device: cuda, mps, cpu)'
+    )
     parser.add_argument(
         '--socket',
         default=None,
@@ -106,35 +121,41 @@ def main() -> None:
             sys.exit(1)
 
         try:
-            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            sock.settimeout(2)
-            sock.connect(str(socket_path))
+            with PinkClient(socket_path, max_connections=1, timeout=2, connect_timeout=2) as client:
+                status = client.health()['status']
 
-            # Send HEALTH command
-            sock.sendall(b"HEALTH\n")
-
-            # Receive response
-            response = sock.recv(1024).decode().strip()
-            sock.close()
-
-            if response == "OK":
+            if status == "OK":
                 print("OK")
                 sys.exit(0)
-            elif response == "LOADING":
+            elif status == "LOADING":
                 print("ERROR: Model is loading", file=sys.stderr)
                 sys.exit(1)
             else:
-                print(f"ERROR: Unexpected response: {response}", file=sys.stderr)
+                print(f"ERROR: Unexpected response: {status}", file=sys.stderr)
                 sys.exit(1)
 
-        except socket.timeout:
+        except TimeoutError:
             print("ERROR: Server timeout", file=sys.stderr)
             sys.exit(1)
         except Exception as e:
             print(f"ERROR: Server not responding: {e}", file=sys.stderr)
             sys.exit(1)
 
-    # Require audio file if not health check
+    # Hot model reload
+    if args.reload is not None:
+        if len(args.reload) > 2:
+            parser.error("--reload takes at most MODEL and DEVICE")
+
+        try:
+            with PinkClient(socket_path, max_connections=1, timeout=None) as client:
+                model_id = client.reload(*args.reload)
+            print(f"OK model={model_id}")
+            sys.exit(0)
+        except Exception as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    # Require audio file if not health check or reload
     if not args.audio_file:
         parser.print_help()
         sys.exit(1)
@@ -145,13 +166,18 @@ def main() -> None:
     # Validate audio file
     validate_audio_file(audio_path)
 
-    # Check server is running
-    if not socket_path.exists():
+    # Check server is running (unless we may start it)
+    if not args.spawn and not socket_path.exists():
         print("ERROR: Server not running", file=sys.stderr)
         sys.exit(1)
 
+    options = {'spawn': args.spawn, 'idle_exit': args.idle_exit}
+
     try:
-        text = transcribe(socket_path, audio_path)
+        if args.channels:
+            text = transcribe_channels(socket_path, audio_path, **options)
+        else:
+            text = transcribe(socket_path, audio_path, **options)
         print(text)
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Pink Transcriber Replay Tool
+Re-drives a server with synthetic audio matching a recorded traffic log.
+
+Record traffic with PINK_TRANSCRIBER_RECORD=/path/to/log.jsonl, then:
+
+    pink-transcriber-replay /path/to/log.jsonl --speed 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from pink_transcriber.client import AsyncPinkClient, TranscriptionError
+from pink_transcriber.config import SOCKET_PATH
+from pink_transcriber.daemon.recorder import read_records
+
+# Sample rate for synthetic audio (opus only supports a few rates)
+SYNTH_SAMPLE_RATE = 16000
+OPUS_SAMPLE_RATES = frozenset({8000, 12000, 16000, 24000, 48000})
+
+# Formats libsndfile can write: extension -> (format, subtype)
+SYNTH_FORMATS = {
+    '.wav': ('WAV', 'PCM_16'),
+    '.flac': ('FLAC', 'PCM_16'),
+    '.aiff': ('AIFF', 'PCM_16'),
+    '.ogg': ('OGG', 'VORBIS'),
+    '.opus': ('OGG', 'OPUS'),
+    '.mp3': ('MP3', 'MPEG_LAYER_III'),
+}
+
+# Duration used when the recording couldn't probe a file and has no size
+DEFAULT_DURATION = 5.0
+
+# Bitrate assumed to estimate duration from size for unprobed files (e.g. m4a/AAC)
+ESTIMATED_BITRATE = 128_000
+
+# Sample rate for stand-ins of unprobed formats (typical for AAC)
+UNPROBED_SAMPLE_RATE = 44100
+
+
+def synthesize_audio(
+    path: Path,
+    duration: float,
+    fmt: str,
+    sample_rate: int = SYNTH_SAMPLE_RATE,
+    channels: int = 1,
+) -> Path:
+    """
+    Write a speech-like synthetic clip (modulated harmonics + noise).
+
+    Formats libsndfile can't write (e.g. .m4a) fall back to .wav, and
+    opus falls back to 48 kHz for rates it doesn't support.
+    Returns the path actually written.
+    """
+    import numpy as np
+    import soundfile
+
+    if fmt not in SYNTH_FORMATS:
+        fmt = '.wav'
+    path = path.with_suffix(fmt)
+    sf_format, subtype = SYNTH_FORMATS[fmt]
+    if fmt == '.opus' and sample_rate not in OPUS_SAMPLE_RATES:
+        sample_rate = 48000
+
+    n = max(1, int(duration * sample_rate))
+    t = np.arange(n, dtype=np.float32) / sample_rate
+    rng = np.random.default_rng(int(duration * 1000))
+
+    # Pitch contour and syllable-rate envelope roughly like voiced speech
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 4 * t)) ** 2
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    audio = 0.2 * envelope * voiced + 0.01 * rng.standard_normal(n)
+
+    # Extra channels: same voice with a small delay and independent noise
+    if channels > 1:
+        audio = np.stack(
+            [np.roll(audio, 40 * c) + 0.01 * rng.standard_normal(n) for c in range(channels)],
+            axis=1,
+        )
+
+    soundfile.write(str(path), audio.astype(np.float32), sample_rate, format=sf_format, subtype=subtype)
+    return path
+
+
+ClipKey = tuple[str, float, int, int]
+
+
+def prepare_clips(records: list[dict], workdir: Path) -> dict[ClipKey, str]:
+    """
+    Synthesize one clip per distinct (format, duration, sample rate, channels).
+
+    Durations are rounded to 0.1s. Matching rate and channel count keeps
+    replayed requests on the same decode path as the recorded ones.
+    """
+    clips: dict[ClipKey, str] = {}
+    for record in records:
+        key = _clip_key(record)
+        if key not in clips:
+            fmt, duration, sample_rate, channels = key
+            name = f"clip-{len(clips):05d}"
+            clips[key] = str(synthesize_audio(
+                workdir / name, duration, fmt, sample_rate=sample_rate, channels=channels
+            ))
+    return clips
+
+
+def _duration(record: dict) -> float:
+    """Recorded duration, else estimated from size, else DEFAULT_DURATION."""
+    if record.get('dur'):
+        return record['dur']
+    if record.get('size'):
+        return max(0.1, record['size'] * 8 / ESTIMATED_BITRATE)
+    return DEFAULT_DURATION
+
+
+def _clip_key(record: dict) -> ClipKey:
+    fmt = record.get('fmt') or '.wav'
+    sample_rate = record.get('sr')
+    if sample_rate is None:
+        # Unprobed formats (m4a) are served by NeMo's loader, not the 16 kHz mono
+        # fast path, so their .wav stand-in must not be 16 kHz mono either.
+        # Logs written before sr/ch were recorded replay as 16 kHz mono.
+        sample_rate = SYNTH_SAMPLE_RATE if fmt in SYNTH_FORMATS else UNPROBED_SAMPLE_RATE
+    return fmt, round(_duration(record), 1), sample_rate, record.get('ch') or 1
+
+
+async def replay(
+    records: list[dict],
+    clips: dict[ClipKey, str],
+    client: AsyncPinkClient,
+    speed: float,
+    max_gap: Optional[float],
+) -> list[dict[str, Any]]:
+    """Send requests on the recorded schedule, return per-request results."""
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+
+    # Build schedule, optionally clipping long idle gaps
+    schedule = []
+    offset = 0.0
+    previous = 0.0
+    for record in records:
+        gap = record['t'] - previous
+        if max_gap is not None and gap > max_gap:
+            offset += gap - max_gap
+        previous = record['t']
+        schedule.append(((record['t'] - offset) / speed, record))
+
+    async def run_one(at: float, record: dict) -> dict[str, Any]:
+        await asyncio.sleep(max(0.0, start + at - loop.time()))
+        sent = loop.time()
+        try:
+            await client.transcribe(clips[_clip_key(record)])
+            ok = True
+        except (TranscriptionError, OSError):
+            ok = False
+        return {'latency': loop.time() - sent, 'ok': ok, 'recorded': record}
+
+    return await asyncio.gather(*(run_one(at, record) for at, record in schedule))
+
+
+async def _run(
+    records: list[dict],
+    clips: dict[ClipKey, str],
+    socket_path: Path,
+    args: argparse.Namespace,
+) -> list[dict[str, Any]]:
+    async with AsyncPinkClient(socket_path, max_connections=args.connections, timeout=None) as client:
+        return await replay(records, clips, client, args.speed, args.max_gap)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def print_report(results: list[dict[str, Any]], elapsed: float) -> None:
+    """Print latency summary, compared with the recorded latencies."""
+    ok = [r for r in results if r['ok']]
+    print(f"Requests:   {len(results)} ({len(results) - len(ok)} failed) in {elapsed:.1f}s")
+    if not ok:
+        return
+
+    print(f"Throughput: {len(ok) / elapsed:.2f} req/s")
+    replayed = [r['latency'] for r in ok]
+    recorded = [r['recorded']['wait'] + r['recorded']['svc'] for r in ok]
+    print(f"{'':12}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for label, values in (('replayed', replayed), ('recorded', recorded)):
+        row = ''.join(f"{_percentile(values, p):9.3f}" for p in (50, 95, 99))
+        print(f"{label:12}{row}{max(values):9.3f}")
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        prog='pink-transcriber-replay',
+        description='Replay a recorded traffic log against a transcription server',
+    )
+    parser.add_argument('log', help='Recorded JSONL log (PINK_TRANSCRIBER_RECORD)')
+    parser.add_argument(
+        '--speed',
+        type=float,
+        default=1.0,
+        help='Replay speed multiplier (default: 1.0 = real time)'
+    )
+    parser.add_argument(
+        '--max-gap',
+        type=float,
+        default=None,
+        help='Clip idle gaps longer than this many seconds (recorded time)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=None,
+        help='Replay only the first N requests'
+    )
+    parser.add_argument(
+        '--connections',
+        type=int,
+        default=64,
+        help='Max concurrent requests in flight (default: 64)'
+    )
+    parser.add_argument(
+        '--socket',
+        default=None,
+        help=f'Path to Unix socket (default: {SOCKET_PATH})'
+    )
+
+    args = parser.parse_args()
+
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+
+    socket_path = Path(args.socket) if args.socket else SOCKET_PATH
+    if not socket_path.exists():
+        print("ERROR: Server not running", file=sys.stderr)
+        sys.exit(1)
+
+    records = read_records(Path(args.log))[:args.limit]
+    if not records:
+        print("ERROR: No records in log", file=sys.stderr)
+        sys.exit(1)
+
+    unprobed = [r for r in records if not r.get('dur')]
+    if unprobed:
+        estimated = sum(1 for r in unprobed if r.get('size'))
+        print(
+            f"{len(unprobed)} records without a probed duration: {estimated} estimated from size "
+            f"at {ESTIMATED_BITRATE // 1000} kbps, {len(unprobed) - estimated} replayed as "
+            f"{DEFAULT_DURATION:.0f}s",
+            flush=True
+        )
+
+    with tempfile.TemporaryDirectory(prefix='pink-replay-') as workdir:
+        clips = prepare_clips(records, Path(workdir))
+        print(f"Replaying {len(records)} requests ({len(clips)} synthetic clips) at {args.speed}x", flush=True)
+
+        started = time.time()
+        results = asyncio.run(_run(records, clips, socket_path, args))
+        print_report(results, time.time() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,14 +15,38 @@ except ImportError:
 
 import asyncio
 import signal
+import time
 from typing import Any
 
-from pink_transcriber.config import VERBOSE_MODE, SOCKET_PATH
+from pink_transcriber.config import (
+    VERBOSE_MODE,
+    SOCKET_PATH,
+    IDLE_EXIT,
+    RECORD_PATH,
+    TENANT_CAPS,
+    TENANT_WEIGHTS,
+    WORKER_COUNT,
+)
 from pink_transcriber.core import model
 from pink_transcriber.daemon import worker
+from pink_transcriber.daemon.launcher import notify_ready
+from pink_transcriber.daemon.recorder import RequestRecorder
+from pink_transcriber.daemon.scheduler import FairQueue
 from pink_transcriber.daemon.singleton import ensure_single_instance
 
 
+async def idle_monitor(queue: FairQueue, idle_exit: float, shutdown_event: asyncio.Event) -> None:
+    """Trigger shutdown once no request has been queued or running for idle_exit seconds."""
+    while not shutdown_event.is_set():
+        await asyncio.sleep(min(idle_exit, 5.0))
+
+        # Closes the queue in the same step, so no request is accepted and then dropped
+        if queue.close_if_idle(idle_exit):
+            if VERBOSE_MODE:
+                print(f"Idle for {idle_exit:.0f}s, shutting down...", flush=True)
+            shutdown_event.set()
+
+
 async def main() -> None:
     """Main server loop."""
     # Verbose mode header
@@ -38,27 +62,76 @@ async def main() -> None:
     if socket_path.exists():
         socket_path.unlink()
 
-    # Create transcription queue
-    queue = asyncio.Queue()
+    # Create transcription queue (weighted fair queuing across tenants)
+    queue = FairQueue(TENANT_WEIGHTS, TENANT_CAPS)
+
+    # Optional anonymised traffic log (for pink-transcriber-replay)
+    recorder = RequestRecorder(RECORD_PATH) if RECORD_PATH else None
 
-    # Start transcription worker
-    worker_task = asyncio.create_task(worker.transcription_worker(queue))
+    if recorder and VERBOSE_MODE:
+        print(f"✓ Recording requests to {RECORD_PATH}", flush=True)
+
+    # Set at shutdown: idle (persistent) client connections close
+    closing = asyncio.Event()
+    handler_tasks: set[asyncio.Task] = set()
 
     # Create Unix socket server BEFORE loading model
     async def client_handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
-        await worker.handle_client(reader, writer, queue)
+        task = asyncio.current_task()
+        handler_tasks.add(task)
+        try:
+            await worker.handle_client(reader, writer, queue, closing)
+        finally:
+            handler_tasks.discard(task)
 
     server = await asyncio.start_unix_server(client_handler, path=str(socket_path))
+    # A server spawned after we stop listening may already own the path
+    socket_inode = socket_path.stat().st_ino
+
+    def remove_socket() -> None:
+        try:
+            if socket_path.stat().st_ino == socket_inode:
+                socket_path.unlink()
+        except FileNotFoundError:
+            pass
 
     if VERBOSE_MODE:
         print(f"✓ Server listening on Unix socket", flush=True)
         print(f"  Socket: {socket_path}", flush=True)
         print("", flush=True)
 
-    # Load model in background (blocking operation)
     loop = asyncio.get_event_loop()
+
+    # SIGHUP: hot-reload model without dropping requests (installed before
+    # loading so an early SIGHUP is refused instead of killing the server)
+    reload_tasks = set()
+
+    def reload_done(task: asyncio.Task) -> None:
+        reload_tasks.discard(task)
+        if not task.cancelled():
+            print(f"Reload (SIGHUP): {task.result()}", flush=True)
+
+    def reload_handler(sig: int, frame: Any) -> None:
+        def start_reload() -> None:
+            task = asyncio.create_task(worker.reload())
+            reload_tasks.add(task)
+            task.add_done_callback(reload_done)
+        loop.call_soon_threadsafe(start_reload)
+
+    signal.signal(signal.SIGHUP, reload_handler)
+
+    # Load model in background (blocking operation)
     await loop.run_in_executor(None, model.load_model)
 
+    # Start transcription workers (requests received while loading wait in queue)
+    worker_tasks = [
+        asyncio.create_task(worker.transcription_worker(queue, recorder))
+        for _ in range(WORKER_COUNT)
+    ]
+
+    # Wake the client that spawned us (lazy start), if any
+    notify_ready()
+
     if VERBOSE_MODE:
         print(f"✓ Model loaded on {model.get_device()}", flush=True)
         print("", flush=True)
@@ -80,28 +153,57 @@ async def main() -> None:
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
+    # Optional idle exit (frees model memory on rarely used hosts)
+    idle_task = None
+    if IDLE_EXIT is not None:
+        queue.last_activity = time.time()
+        idle_task = asyncio.create_task(idle_monitor(queue, IDLE_EXIT, shutdown_event))
+
     try:
         # Run until shutdown signal
         await shutdown_event.wait()
 
-        # Stop worker with sentinel
-        await queue.put(None)
-        try:
-            await asyncio.wait_for(worker_task, timeout=2.0)
-        except asyncio.TimeoutError:
+        if idle_task is not None:
+            idle_task.cancel()
+            try:
+                await idle_task
+            except asyncio.CancelledError:
+                pass
+
+        # Stop accepting new requests and connections; idle ones close at their next read
+        queue.close()
+        closing.set()
+        server.close()
+
+        # Stop workers with one sentinel each (queued requests are served first)
+        for _ in worker_tasks:
+            await queue.put(None)
+        _, pending = await asyncio.wait(worker_tasks, timeout=2.0)
+        for worker_task in pending:
             worker_task.cancel()
             try:
                 await worker_task
             except asyncio.CancelledError:
                 pass
 
-        # Stop accepting new connections
-        server.close()
+        # Requests the workers didn't get to are answered with an error
+        for request in await queue.drain():
+            if not request.result_future.done():
+                request.result_future.set_exception(RuntimeError("Server shutting down"))
+
+        # Let handlers send responses already computed, then drop stragglers
+        # (wait_closed() waits for every connection on Python 3.12+)
+        if handler_tasks:
+            _, stuck = await asyncio.wait(set(handler_tasks), timeout=2.0)
+            for task in stuck:
+                task.cancel()
         await server.wait_closed()
 
         # Remove socket
-        if socket_path.exists():
-            socket_path.unlink()
+        remove_socket()
+
+        if recorder:
+            recorder.close()
 
         if VERBOSE_MODE:
             print("✓ Server stopped", flush=True)
@@ -110,8 +212,7 @@ async def main() -> None:
         if VERBOSE_MODE:
             print(f"✗ Error during shutdown: {e}", flush=True)
         # Clean up socket anyway
-        if socket_path.exists():
-            socket_path.unlink()
+        remove_socket()
         raise
 
 
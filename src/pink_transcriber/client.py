@@ -0,0 +1,540 @@
+"""
+Python client library for the pink-transcriber server.
+
+Keeps a pool of persistent Unix socket connections, so many concurrent
+requests can share a handful of sockets without reconnecting per call.
+
+    from pink_transcriber import PinkClient
+
+    with PinkClient() as client:
+        print(client.transcribe("/path/to/audio.ogg"))
+        texts = client.transcribe_many(["a.wav", "b.mp3"])
+
+    async with AsyncPinkClient() as client:
+        text = await client.transcribe("/path/to/audio.ogg")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import queue
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+from pink_transcriber.config import SOCKET_PATH
+from pink_transcriber.daemon.launcher import ensure_server
+
+# Defaults for pools and timeouts
+DEFAULT_MAX_CONNECTIONS = 4
+DEFAULT_TIMEOUT = 600.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_RETRIES = 1
+
+# Initial receive buffer size (grows if a response doesn't fit)
+BUFFER_SIZE = 64 * 1024
+
+
+class TranscriptionError(RuntimeError):
+    """Server returned an error for the request."""
+
+
+class ServerNotRunningError(ConnectionError):
+    """Server socket is missing or refuses connections."""
+
+
+class _StaleConnection(ConnectionError):
+    """Connection was closed by the server before it answered (safe to retry)."""
+
+
+class _LineBuffer:
+    """Preallocated receive buffer that yields newline-terminated responses."""
+
+    def __init__(self, size: int = BUFFER_SIZE) -> None:
+        self._buf = bytearray(size)
+        self._end = 0
+
+    def free_space(self) -> memoryview:
+        """Writable view of the unused tail (grows the buffer when full)."""
+        if self._end == len(self._buf):
+            self._buf.extend(bytes(len(self._buf)))
+        return memoryview(self._buf)[self._end:]
+
+    def advance(self, n: int) -> None:
+        """Mark n bytes written into free_space() as filled."""
+        self._end += n
+
+    def pop_line(self) -> Optional[bytes]:
+        """Remove and return the first complete line (without newline), if any."""
+        index = self._buf.find(b'\n', 0, self._end)
+        if index < 0:
+            return None
+
+        line = bytes(self._buf[:index])
+        rest = self._end - index - 1
+        if rest:
+            self._buf[:rest] = self._buf[index + 1:self._end]
+        self._end = rest
+        return line
+
+
+def _parse_response(line: str) -> str:
+    """Strip response line, raising TranscriptionError for server errors."""
+    text = line.strip()
+    if text.startswith("ERROR:"):
+        raise TranscriptionError(text[7:])
+    return text
+
+
+def _parse_health(line: str) -> dict[str, str]:
+    """Parse 'STATUS key=value ...' into {'status': STATUS, key: value, ...}."""
+    status, *fields = line.split()
+    health = {'status': status}
+    for item in fields:
+        key, _, value = item.partition('=')
+        health[key] = value
+    return health
+
+
+def _json_request(audio_path: Union[str, Path], **options: Any) -> str:
+    """Transcription request with options (JSON object form, unset options omitted)."""
+    options = {key: value for key, value in options.items() if value is not None}
+    return json.dumps({'path': os.path.abspath(audio_path), **options})
+
+
+def _reload_command(model_name: Optional[str], device: Optional[str]) -> str:
+    if device and not model_name:
+        raise ValueError("device requires model_name")
+    return ' '.join(["RELOAD", *filter(None, [model_name, device])])
+
+
+def _encode_request(message: str) -> bytes:
+    if '\n' in message:
+        raise ValueError("Request must not contain newlines")
+    return message.encode() + b'\n'
+
+
+# ============================================================================
+# Sync client
+# ============================================================================
+
+class _Connection:
+    """Blocking connection to the server."""
+
+    def __init__(self, socket_path: Path, connect_timeout: float) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.buffer = _LineBuffer()
+        try:
+            self.sock.settimeout(connect_timeout)
+            self.sock.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            self.sock.close()
+            raise ServerNotRunningError(f"Server not running ({socket_path})") from e
+        except BaseException:
+            self.sock.close()
+            raise
+
+    def request(self, message: bytes, timeout: Optional[float]) -> bytes:
+        """Send one request line and return the response line."""
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.sendall(message)
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise _StaleConnection(str(e)) from e
+
+        received = False
+        while (line := self.buffer.pop_line()) is None:
+            with self.buffer.free_space() as view:
+                try:
+                    n = self.sock.recv_into(view)
+                except ConnectionResetError as e:
+                    if received:
+                        raise
+                    raise _StaleConnection(str(e)) from e
+            if n == 0:
+                if received:
+                    raise ConnectionError("Server closed connection mid-response")
+                raise _StaleConnection("Server closed connection")
+            self.buffer.advance(n)
+            received = True
+        return line
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class PinkClient:
+    """
+    Thread-safe client with a pool of persistent connections.
+
+    Args:
+        socket_path: Server socket (default: SOCKET_PATH)
+        max_connections: Max concurrent requests / pooled sockets
+        timeout: Per-request timeout in seconds (None = wait forever)
+        connect_timeout: Timeout for establishing a connection
+        retries: Retries when a new connection is closed before answering
+                 (stale pooled connections are always replaced)
+        tenant: Tenant id for fair queuing (default: server derives it from our uid)
+        spawn: Start the server in the background if it isn't running
+        idle_exit: With spawn, seconds of inactivity after which that server exits
+    """
+
+    def __init__(
+        self,
+        socket_path: Union[str, Path, None] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        tenant: Optional[str] = None,
+        spawn: bool = False,
+        idle_exit: Optional[float] = None,
+    ) -> None:
+        self.socket_path = Path(socket_path) if socket_path else SOCKET_PATH
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self.tenant = tenant
+        self.spawn = spawn
+        self.idle_exit = idle_exit
+
+        self._idle: queue.LifoQueue[_Connection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._closed = False
+
+    def _transcribe_request(self, audio_path: Union[str, Path]) -> str:
+        if self.tenant is None:
+            return os.path.abspath(audio_path)
+        return _json_request(audio_path, tenant=self.tenant)
+
+    def _acquire(self) -> tuple[_Connection, bool]:
+        """Pooled connection if one is idle, else a new one: (conn, pooled)."""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            pass
+
+        try:
+            return _Connection(self.socket_path, self.connect_timeout), False
+        except ServerNotRunningError:
+            if not self.spawn:
+                raise
+
+        ensure_server(self.socket_path, self.idle_exit)
+        return _Connection(self.socket_path, self.connect_timeout), False
+
+    def _release(self, conn: _Connection) -> None:
+        self._idle.put(conn)
+        # close() may have run while the request was in flight
+        if self._closed:
+            self._close_idle()
+
+    def _close_idle(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _request(self, message: str, timeout: Optional[float] = None) -> str:
+        """
+        Send request over a pooled connection, retrying on stale sockets.
+
+        A stale pooled connection means the server went away (e.g. restart or
+        idle exit), so the whole pool is dropped and the request is retried
+        on a new connection; only failures of new connections count
+        against retries.
+        """
+        if self._closed:
+            raise RuntimeError("Client is closed")
+
+        data = _encode_request(message)
+        timeout = self.timeout if timeout is None else timeout
+
+        with self._slots:
+            attempt = 0
+            while True:
+                conn, pooled = self._acquire()
+                try:
+                    line = conn.request(data, timeout)
+                except _StaleConnection as e:
+                    conn.close()
+                    if pooled:
+                        self._close_idle()
+                        continue
+                    if attempt >= self.retries:
+                        raise ConnectionError(f"Server closed connection: {e}") from None
+                    attempt += 1
+                    continue
+                except BaseException:
+                    conn.close()
+                    raise
+
+                self._release(conn)
+                return line.decode()
+
+    def transcribe(self, audio_path: Union[str, Path], timeout: Optional[float] = None) -> str:
+        """Transcribe audio file and return text."""
+        return _parse_response(self._request(self._transcribe_request(audio_path), timeout))
+
+    def transcribe_channels(self, audio_path: Union[str, Path], timeout: Optional[float] = None) -> dict[str, Any]:
+        """
+        Transcribe each channel separately (e.g. one call party per channel).
+
+        Returns {'channels': [{'channel', 'text'}, ...],
+                 'segments': [{'channel', 'start', 'end', 'text'}, ...]}
+        with segments interleaved by start time.
+        """
+        message = _json_request(audio_path, channels=True, tenant=self.tenant)
+        return json.loads(_parse_response(self._request(message, timeout)))
+
+    def transcribe_many(
+        self,
+        audio_paths: Iterable[Union[str, Path]],
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """
+        Transcribe several files concurrently (up to max_connections at once).
+
+        Results are returned in input order. With return_exceptions=True,
+        failures are returned in place of text instead of raised.
+        """
+        def run(path: Union[str, Path]) -> Any:
+            try:
+                return self.transcribe(path, timeout)
+            except Exception as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        with ThreadPoolExecutor(max_workers=self.max_connections) as pool:
+            return list(pool.map(run, audio_paths))
+
+    def health(self, timeout: Optional[float] = None) -> dict[str, str]:
+        """Query server health: {'status': 'OK' | 'LOADING', ...}."""
+        return _parse_health(self._request("HEALTH", timeout))
+
+    def stats(self, timeout: Optional[float] = None) -> dict[str, Any]:
+        """Scheduler metrics: {'pending': n, 'tenants': {tenant: {...}}}."""
+        return json.loads(_parse_response(self._request("STATS", timeout)))
+
+    def reload(
+        self,
+        model_name: Optional[str] = None,
+        device: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """Hot-reload the server model (blocks until switched), return new model id."""
+        response = self._request(_reload_command(model_name, device), timeout)
+        return _parse_health(_parse_response(response))['model']
+
+    def close(self) -> None:
+        """Close all pooled connections (in-flight ones are closed when done)."""
+        self._closed = True
+        self._close_idle()
+
+    def __enter__(self) -> PinkClient:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+# ============================================================================
+# Async client
+# ============================================================================
+
+class _AsyncConnection:
+    """Non-blocking connection driven by the event loop."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.buffer = _LineBuffer()
+
+    @classmethod
+    async def open(cls, socket_path: Path, connect_timeout: float) -> _AsyncConnection:
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, str(socket_path)), connect_timeout)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            sock.close()
+            raise ServerNotRunningError(f"Server not running ({socket_path})") from e
+        except BaseException:
+            sock.close()
+            raise
+        return cls(sock)
+
+    async def request(self, message: bytes) -> bytes:
+        """Send one request line and return the response line."""
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.sock_sendall(self.sock, message)
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise _StaleConnection(str(e)) from e
+
+        received = False
+        while (line := self.buffer.pop_line()) is None:
+            with self.buffer.free_space() as view:
+                try:
+                    n = await loop.sock_recv_into(self.sock, view)
+                except ConnectionResetError as e:
+                    if received:
+                        raise
+                    raise _StaleConnection(str(e)) from e
+            if n == 0:
+                if received:
+                    raise ConnectionError("Server closed connection mid-response")
+                raise _StaleConnection("Server closed connection")
+            self.buffer.advance(n)
+            received = True
+        return line
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class AsyncPinkClient:
+    """
+    Asyncio client with a pool of persistent connections.
+
+    Same arguments as PinkClient. Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        socket_path: Union[str, Path, None] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        tenant: Optional[str] = None,
+        spawn: bool = False,
+        idle_exit: Optional[float] = None,
+    ) -> None:
+        self.socket_path = Path(socket_path) if socket_path else SOCKET_PATH
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self.tenant = tenant
+        self.spawn = spawn
+        self.idle_exit = idle_exit
+
+        self._idle: list[_AsyncConnection] = []
+        self._slots = asyncio.Semaphore(max_connections)
+        self._closed = False
+
+    _transcribe_request = PinkClient._transcribe_request
+
+    async def _acquire(self) -> tuple[_AsyncConnection, bool]:
+        """Pooled connection if one is idle, else a new one: (conn, pooled)."""
+        if self._idle:
+            return self._idle.pop(), True
+
+        try:
+            return await _AsyncConnection.open(self.socket_path, self.connect_timeout), False
+        except ServerNotRunningError:
+            if not self.spawn:
+                raise
+
+        await asyncio.to_thread(ensure_server, self.socket_path, self.idle_exit)
+        return await _AsyncConnection.open(self.socket_path, self.connect_timeout), False
+
+    def _close_idle(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+    async def _request(self, message: str, timeout: Optional[float] = None) -> str:
+        """Send request over a pooled connection, retrying on stale sockets (see PinkClient)."""
+        if self._closed:
+            raise RuntimeError("Client is closed")
+
+        data = _encode_request(message)
+        timeout = self.timeout if timeout is None else timeout
+
+        async with self._slots:
+            attempt = 0
+            while True:
+                conn, pooled = await self._acquire()
+                try:
+                    line = await asyncio.wait_for(conn.request(data), timeout)
+                except _StaleConnection as e:
+                    conn.close()
+                    if pooled:
+                        self._close_idle()
+                        continue
+                    if attempt >= self.retries:
+                        raise ConnectionError(f"Server closed connection: {e}") from None
+                    attempt += 1
+                    continue
+                except BaseException:
+                    conn.close()
+                    raise
+
+                if self._closed:
+                    conn.close()
+                else:
+                    self._idle.append(conn)
+                return line.decode()
+
+    async def transcribe(self, audio_path: Union[str, Path], timeout: Optional[float] = None) -> str:
+        """Transcribe audio file and return text."""
+        return _parse_response(await self._request(self._transcribe_request(audio_path), timeout))
+
+    async def transcribe_channels(
+        self,
+        audio_path: Union[str, Path],
+        timeout: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """Transcribe each channel separately (see PinkClient.transcribe_channels)."""
+        message = _json_request(audio_path, channels=True, tenant=self.tenant)
+        return json.loads(_parse_response(await self._request(message, timeout)))
+
+    async def transcribe_many(
+        self,
+        audio_paths: Iterable[Union[str, Path]],
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """Transcribe several files concurrently (up to max_connections at once)."""
+        return await asyncio.gather(
+            *(self.transcribe(path, timeout) for path in audio_paths),
+            return_exceptions=return_exceptions,
+        )
+
+    async def health(self, timeout: Optional[float] = None) -> dict[str, str]:
+        """Query server health: {'status': 'OK' | 'LOADING', ...}."""
+        return _parse_health(await self._request("HEALTH", timeout))
+
+    async def stats(self, timeout: Optional[float] = None) -> dict[str, Any]:
+        """Scheduler metrics: {'pending': n, 'tenants': {tenant: {...}}}."""
+        return json.loads(_parse_response(await self._request("STATS", timeout)))
+
+    async def reload(
+        self,
+        model_name: Optional[str] = None,
+        device: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """Hot-reload the server model (waits until switched), return new model id."""
+        response = await self._request(_reload_command(model_name, device), timeout)
+        return _parse_health(_parse_response(response))['model']
+
+    async def close(self) -> None:
+        """Close all pooled connections (in-flight ones are closed when done)."""
+        self._closed = True
+        self._close_idle()
+
+    async def __aenter__(self) -> AsyncPinkClient:
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
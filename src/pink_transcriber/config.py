@@ -4,7 +4,8 @@ import os
 from pathlib import Path
 
 # Socket path for Unix domain socket
-SOCKET_PATH = Path("/tmp/pink-transcriber.sock")
+DEFAULT_SOCKET_PATH = '/tmp/pink-transcriber.sock'
+SOCKET_PATH = Path(os.getenv('PINK_TRANSCRIBER_SOCKET', DEFAULT_SOCKET_PATH))
 
 # Supported audio formats
 SUPPORTED_AUDIO_FORMATS = frozenset({
@@ -14,8 +15,38 @@ SUPPORTED_AUDIO_FORMATS = frozenset({
 # Verbose mode flag (enable detailed logging)
 VERBOSE_MODE = os.getenv('VERBOSE') == '1'
 
-# Process identifiers for singleton detection
-SINGLETON_IDENTIFIERS = ['pink-transcriber', 'pink_transcriber', 'Pink Transcriber']
+# Process identifiers for singleton detection (server only - clients may be
+# waiting on a server they just spawned and must not be killed)
+SINGLETON_IDENTIFIERS = ['pink-transcriber-server', 'pink_transcriber.cli.server', 'Pink Transcriber']
+
+# ASR model (Hugging Face / NGC name) and optional device override (cuda, mps, cpu)
+MODEL_NAME = os.getenv('PINK_TRANSCRIBER_MODEL', 'nvidia/parakeet-tdt-0.6b-v3')
+MODEL_DEVICE = os.getenv('PINK_TRANSCRIBER_DEVICE') or None
+
+# Request recording (anonymised JSONL traffic log for replay), disabled if unset
+RECORD_PATH = Path(os.environ['PINK_TRANSCRIBER_RECORD']) if os.getenv('PINK_TRANSCRIBER_RECORD') else None
+
+# Exit server after this many seconds without requests (disabled if unset)
+IDLE_EXIT = float(os.environ['PINK_TRANSCRIBER_IDLE_EXIT']) if os.getenv('PINK_TRANSCRIBER_IDLE_EXIT') else None
+
+# Number of concurrent transcription workers (per-tenant caps apply across them).
+# Workers overlap decoding; inference on one model instance runs one at a time.
+WORKER_COUNT = max(1, int(os.getenv('PINK_TRANSCRIBER_WORKERS', '1')))
+
+
+def _parse_tenant_map(value: str) -> dict[str, str]:
+    """Parse 'tenant=value,tenant2=value2' ('*' = default for other tenants)."""
+    result = {}
+    for item in value.split(','):
+        key, sep, val = item.partition('=')
+        if sep and key.strip():
+            result[key.strip()] = val.strip()
+    return result
+
+
+# Fair queuing: per-tenant weights and concurrency caps, e.g. "interactive=4,*=1"
+TENANT_WEIGHTS = {k: float(v) for k, v in _parse_tenant_map(os.getenv('PINK_TRANSCRIBER_TENANT_WEIGHTS', '')).items()}
+TENANT_CAPS = {k: int(v) for k, v in _parse_tenant_map(os.getenv('PINK_TRANSCRIBER_TENANT_CAPS', '')).items()}
 
 # Legacy: support DEV=1 for backward compatibility
 if os.getenv('DEV') == '1':
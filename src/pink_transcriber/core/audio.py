@@ -0,0 +1,151 @@
+"""
+Audio preprocessing: decode, downmix and resample to the model's 16 kHz mono.
+
+Decodes with soundfile straight into a preallocated float32 buffer,
+downmixes with NumPy and resamples with a polyphase FIR whose filter
+bank is designed once per (up, down) ratio and cached.
+
+Single-stream transcription only decodes in-process when the file is
+already 16 kHz mono (load_audio); other input is slower here than in
+NeMo's loader (see benchmarks/bench_preprocess.py) and goes through it.
+Per-channel transcription needs the channels in memory and always
+uses the kernel.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from math import gcd
+from typing import Any, Optional
+
+# Sample rate expected by the ASR model
+MODEL_SAMPLE_RATE = 16000
+
+# Anti-aliasing filter design (same as scipy.signal.resample_poly defaults)
+FILTER_HALF_LENGTH_FACTOR = 10
+FILTER_WINDOW = ('kaiser', 5.0)
+
+
+@lru_cache(maxsize=32)
+def _filter_bank(up: int, down: int) -> tuple[Any, int]:
+    """
+    Design low-pass FIR for an up/down polyphase resampler.
+
+    Returns (taps, n_pre_remove): taps are pre-padded so that output
+    sample 0 lines up with input sample 0 after dropping n_pre_remove
+    leading outputs.
+    """
+    import numpy as np
+    from scipy.signal import firwin
+
+    max_rate = max(up, down)
+    half_len = FILTER_HALF_LENGTH_FACTOR * max_rate
+    taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=FILTER_WINDOW) * up
+
+    n_pre_pad = down - half_len % down
+    n_pre_remove = (half_len + n_pre_pad) // down
+    taps = np.concatenate([np.zeros(n_pre_pad), taps]).astype(np.float32)
+    taps.setflags(write=False)
+    return taps, n_pre_remove
+
+
+def resample(samples: Any, source_rate: int) -> Any:
+    """Resample float32 array (1-D, or 2-D with time on axis 0) to MODEL_SAMPLE_RATE."""
+    if source_rate == MODEL_SAMPLE_RATE:
+        return samples
+
+    import numpy as np
+    from scipy.signal import upfirdn
+
+    divisor = gcd(source_rate, MODEL_SAMPLE_RATE)
+    up = MODEL_SAMPLE_RATE // divisor
+    down = source_rate // divisor
+    taps, n_pre_remove = _filter_bank(up, down)
+
+    n_in = samples.shape[0]
+    n_out = -(-n_in * up // down)
+    resampled = upfirdn(taps, samples, up, down, axis=0)[n_pre_remove:n_pre_remove + n_out]
+
+    # Tail beyond the filter's reach is silence
+    if resampled.shape[0] < n_out:
+        padding = [(0, n_out - resampled.shape[0])] + [(0, 0)] * (samples.ndim - 1)
+        resampled = np.pad(resampled, padding)
+
+    return resampled.astype(np.float32, copy=False)
+
+
+def decode(audio_path: str, mono: bool = False) -> tuple[Any, int]:
+    """
+    Decode file with libsndfile into a preallocated float32 buffer.
+
+    Returns (samples, sample_rate): shape (frames,) for mono files or
+    when mono=True (channels averaged), else (frames, channels).
+    Raises soundfile.LibsndfileError for formats libsndfile can't read.
+    """
+    import numpy as np
+    import soundfile
+
+    with soundfile.SoundFile(audio_path) as f:
+        sample_rate = f.samplerate
+        channels = f.channels
+        shape = (f.frames,) if channels == 1 else (f.frames, channels)
+        buffer = np.empty(shape, dtype=np.float32)
+        # Returns a view of the filled part (frame counts can be estimates, e.g. mp3)
+        samples = f.read(out=buffer)
+
+    if mono and samples.ndim == 2:
+        samples = samples.mean(axis=1, dtype=np.float32)
+
+    return samples, sample_rate
+
+
+def load_audio(audio_path: str) -> Optional[Any]:
+    """
+    Decode a 16 kHz mono file to float32 as is.
+
+    Returns None when the file needs downmixing/resampling or libsndfile
+    can't read the format, so the caller can use NeMo's loader instead.
+    """
+    import soundfile
+
+    try:
+        info = soundfile.info(audio_path)
+        if info.samplerate != MODEL_SAMPLE_RATE or info.channels != 1:
+            return None
+        samples, _ = decode(audio_path)
+    except soundfile.LibsndfileError:
+        return None
+
+    return samples
+
+
+def _decode_any(audio_path: str) -> tuple[Any, int]:
+    """decode(), falling back to librosa/audioread for formats like m4a."""
+    import soundfile
+
+    try:
+        return decode(audio_path)
+    except soundfile.LibsndfileError:
+        pass
+
+    import librosa
+
+    samples, sample_rate = librosa.load(audio_path, sr=None, mono=False)
+    return samples.T, sample_rate
+
+
+def load_channels(audio_path: str) -> list[Any]:
+    """
+    Decode audio file and return one 16 kHz float32 array per channel.
+
+    Mono files return a single-element list.
+    """
+    import numpy as np
+
+    samples, sample_rate = _decode_any(audio_path)
+    if samples.ndim == 1:
+        return [resample(samples, sample_rate)]
+
+    # Resample all channels in one pass, then split
+    resampled = resample(samples, sample_rate)
+    return [np.ascontiguousarray(resampled[:, channel]) for channel in range(resampled.shape[1])]
@@ -4,20 +4,53 @@ Model loading and transcription logic.
 
 from __future__ import annotations
 
+import gc
 import os
 import sys
-from typing import Any, Optional
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
 
-from pink_transcriber.config import VERBOSE_MODE, get_model_cache_dir
+from pink_transcriber.config import VERBOSE_MODE, MODEL_NAME, MODEL_DEVICE, get_model_cache_dir
+from pink_transcriber.core import audio
 
-_model: Optional[Any] = None
-_device: Optional[str] = None
+# Device names accepted for MODEL_DEVICE / RELOAD, in auto-detection order
+DEVICES = ('cuda', 'mps', 'cpu')
 
 
-def load_model() -> None:
-    """Load Parakeet TDT v3 model with MPS support."""
-    global _model, _device
+@dataclass
+class _Instance:
+    """Loaded model plus the number of transcriptions currently using it."""
+    model: Any
+    device: str
+    model_name: str
+    active: int = 0
+    # NeMo's transcribe() isn't re-entrant: one call per model object at a time
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def model_id(self) -> str:
+        return f"{self.model_name}@{self.device}"
+
+
+_current: Optional[_Instance] = None
+_draining: Optional[_Instance] = None
+_reloading_id: Optional[str] = None
+
+# Guards _current/_draining and instance.active; notified when active drops
+_state = threading.Condition()
+# Serializes reloads
+_reload_lock = threading.Lock()
 
+# Shared stdout/stderr redirect state (see _suppress_output)
+_suppress_lock = threading.Lock()
+_suppress_depth = 0
+_saved_fds: tuple[int, int] = (-1, -1)
+
+
+def _prepare_environment() -> None:
+    """Point NeMo/HF caches at the model dir and silence their logging."""
     # Set cache directory BEFORE any imports (portable)
     model_cache_dir = get_model_cache_dir()
     model_cache_dir.mkdir(exist_ok=True)
@@ -29,47 +62,86 @@ def load_model() -> None:
     os.environ['HYDRA_FULL_ERROR'] = '0'
     os.environ['PYTHONWARNINGS'] = 'ignore'
 
+    import logging
+
+    # Suppress all NeMo loggers
+    logging.getLogger('nemo_logger').setLevel(logging.CRITICAL)
+    logging.getLogger('nemo').setLevel(logging.CRITICAL)
+    logging.getLogger('pytorch_lightning').setLevel(logging.CRITICAL)
+    logging.getLogger('lightning').setLevel(logging.CRITICAL)
+    logging.getLogger('lightning.pytorch').setLevel(logging.CRITICAL)
+
+
+def _load_instance(model_name: str, device: Optional[str]) -> _Instance:
+    """
+    Load a model instance and move it to a device.
+
+    Args:
+        model_name: Pretrained model name
+        device: 'cuda', 'mps', 'cpu' or None for auto-detection
+                (falls back to CPU if the device can't be used)
+    """
+    _prepare_environment()
+
+    import nemo.collections.asr as nemo_asr
+    import torch
+
+    if device is not None and device.lower() not in DEVICES:
+        raise ValueError(f"Unknown device: {device} (expected one of: {', '.join(DEVICES)})")
+
+    # Load model
+    if VERBOSE_MODE:
+        print(f"Loading {model_name}...", flush=True)
+
+    asr_model = nemo_asr.models.ASRModel.from_pretrained(model_name)
+
+    # Use CUDA if available, then MPS (Metal), otherwise CPU
+    if device is not None:
+        candidates = [device.lower()]
+    else:
+        candidates = []
+        if torch.cuda.is_available():
+            candidates.append('cuda')
+        if torch.backends.mps.is_available():
+            candidates.append('mps')
+
+    for candidate in candidates:
+        try:
+            return _Instance(asr_model.to(candidate), candidate.upper(), model_name)
+        except Exception:
+            pass
+
+    return _Instance(asr_model.to('cpu'), 'CPU', model_name)
+
+
+def _free_instance(instance: _Instance) -> None:
+    """Drop model weights and return cached accelerator memory."""
+    device = instance.device
+    instance.model = None
+    gc.collect()
+
     try:
-        import nemo.collections.asr as nemo_asr
         import torch
-        import logging
+        if device == 'CUDA':
+            torch.cuda.empty_cache()
+        elif device == 'MPS':
+            torch.mps.empty_cache()
+    except Exception:
+        pass
 
-        # Suppress all NeMo loggers
-        logging.getLogger('nemo_logger').setLevel(logging.CRITICAL)
-        logging.getLogger('nemo').setLevel(logging.CRITICAL)
-        logging.getLogger('pytorch_lightning').setLevel(logging.CRITICAL)
-        logging.getLogger('lightning').setLevel(logging.CRITICAL)
-        logging.getLogger('lightning.pytorch').setLevel(logging.CRITICAL)
 
-        # Load model
-        if VERBOSE_MODE:
-            print("Loading Parakeet TDT v3 model...", flush=True)
+def load_model() -> None:
+    """Load Parakeet TDT v3 model with MPS support."""
+    global _current
 
-        _model = nemo_asr.models.ASRModel.from_pretrained(
-            "nvidia/parakeet-tdt-0.6b-v3"
-        )
+    try:
+        instance = _load_instance(MODEL_NAME, MODEL_DEVICE)
 
-        # Use CUDA if available, then MPS (Metal), otherwise CPU
-        if torch.cuda.is_available():
-            try:
-                _model = _model.to('cuda')
-                _device = 'CUDA'
-            except Exception:
-                _model = _model.to('cpu')
-                _device = 'CPU'
-        elif torch.backends.mps.is_available():
-            try:
-                _model = _model.to('mps')
-                _device = 'MPS'
-            except Exception:
-                _model = _model.to('cpu')
-                _device = 'CPU'
-        else:
-            _model = _model.to('cpu')
-            _device = 'CPU'
+        with _state:
+            _current = instance
 
         if VERBOSE_MODE:
-            print(f"✓ Model loaded on {_device}", flush=True)
+            print(f"✓ Model loaded on {instance.device}", flush=True)
 
     except ImportError as e:
         print("\n" + "="*60, file=sys.stderr)
@@ -99,52 +171,222 @@ def load_model() -> None:
         sys.exit(1)
 
 
-def transcribe(audio_path: str) -> str:
-    """Transcribe audio file to text."""
-    if _model is None:
-        raise RuntimeError("Model not loaded")
+def reload_model(model_name: Optional[str] = None, device: Optional[str] = None) -> str:
+    """
+    Load a new model instance while the current one keeps serving, then swap.
 
-    if not os.path.exists(audio_path):
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    After the switch, new transcriptions use the new instance; the old one
+    is freed once its in-flight transcriptions finish. On failure the
+    current model stays in place and the exception propagates.
+    Refused while the initial load_model() is still running.
+
+    Args:
+        model_name: Model to load (default: same as current)
+        device: Device to use (default: same preference as at startup)
+
+    Returns:
+        New model id ("<model_name>@<DEVICE>")
+    """
+    global _current, _draining, _reloading_id
+
+    if not _reload_lock.acquire(blocking=False):
+        raise RuntimeError("Reload already in progress")
 
     try:
-        # Suppress stdout/stderr during transcription
-        old_stdout_fd = os.dup(1)
-        old_stderr_fd = os.dup(2)
-        devnull_fd = os.open(os.devnull, os.O_WRONLY)
+        with _state:
+            if _current is None:
+                raise RuntimeError("Model is loading")
+            if model_name is None:
+                model_name = _current.model_name
+        if device is None:
+            device = MODEL_DEVICE
 
+        _reloading_id = f"{model_name}@{(device or 'auto').upper()}"
         try:
+            new = _load_instance(model_name, device)
+        finally:
+            _reloading_id = None
+
+        # Atomic switch, then wait for in-flight work on the old instance
+        with _state:
+            old = _current
+            _current = new
+            _draining = old
+            if old is not None:
+                _state.wait_for(lambda: old.active == 0)
+            _draining = None
+
+        if old is not None:
+            _free_instance(old)
+
+        if VERBOSE_MODE:
+            old_id = old.model_id if old else "none"
+            print(f"✓ Model reloaded: {old_id} -> {new.model_id}", flush=True)
+
+        return new.model_id
+
+    finally:
+        _reload_lock.release()
+
+
+@contextmanager
+def _pinned_instance() -> Iterator[_Instance]:
+    """Pin the current instance so a concurrent reload can't free it under us."""
+    with _state:
+        instance = _current
+        if instance is None:
+            raise RuntimeError("Model not loaded")
+        instance.active += 1
+
+    try:
+        yield instance
+    finally:
+        with _state:
+            instance.active -= 1
+            _state.notify_all()
+
+
+@contextmanager
+def _suppress_output() -> Iterator[None]:
+    """
+    Redirect stdout/stderr file descriptors to /dev/null (silences NeMo).
+
+    Reference-counted so concurrent workers share one redirect instead of
+    saving and restoring each other's /dev/null descriptors.
+    """
+    global _suppress_depth, _saved_fds
+
+    with _suppress_lock:
+        if _suppress_depth == 0:
+            old_stdout_fd = os.dup(1)
+            old_stderr_fd = os.dup(2)
+            devnull_fd = os.open(os.devnull, os.O_WRONLY)
             os.dup2(devnull_fd, 1)
             os.dup2(devnull_fd, 2)
+            os.close(devnull_fd)
+            _saved_fds = (old_stdout_fd, old_stderr_fd)
+        _suppress_depth += 1
 
-            result = _model.transcribe([audio_path], verbose=False, batch_size=1)
+    try:
+        yield
 
-        finally:
-            os.dup2(old_stdout_fd, 1)
-            os.dup2(old_stderr_fd, 2)
-            os.close(devnull_fd)
-            os.close(old_stdout_fd)
-            os.close(old_stderr_fd)
-
-        # Extract text from result
-        if isinstance(result, list) and len(result) > 0:
-            first_result = result[0]
-            if hasattr(first_result, 'text'):
-                return first_result.text
+    finally:
+        with _suppress_lock:
+            _suppress_depth -= 1
+            if _suppress_depth == 0:
+                old_stdout_fd, old_stderr_fd = _saved_fds
+                os.dup2(old_stdout_fd, 1)
+                os.dup2(old_stderr_fd, 2)
+                os.close(old_stdout_fd)
+                os.close(old_stderr_fd)
+
+
+def transcribe(audio_path: str) -> str:
+    """Transcribe audio file to text."""
+    if not os.path.exists(audio_path):
+        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+    # 16 kHz mono decodes in-process; anything else goes through NeMo's loader
+    try:
+        samples = audio.load_audio(audio_path)
+    except Exception as e:
+        raise RuntimeError(f"Failed to decode audio: {e}")
+    source = samples if samples is not None else audio_path
+
+    with _pinned_instance() as instance:
+        try:
+            # Suppress stdout/stderr during transcription
+            with instance.lock, _suppress_output():
+                result = instance.model.transcribe([source], verbose=False, batch_size=1)
+
+            # Extract text from result
+            if isinstance(result, list) and len(result) > 0:
+                first_result = result[0]
+                if hasattr(first_result, 'text'):
+                    return first_result.text
+                else:
+                    return str(first_result)
             else:
-                return str(first_result)
-        else:
-            return str(result) if result else ""
+                return str(result) if result else ""
+
+        except Exception as e:
+            raise RuntimeError(f"Transcription failed: {e}")
+
+
+def transcribe_channels(audio_path: str) -> dict[str, Any]:
+    """
+    Transcribe each channel of a multichannel file separately, in one batch.
+
+    Returns:
+        {
+            "channels": [{"channel": 0, "text": "..."}, ...],
+            "segments": [{"channel": 0, "start": 0.0, "end": 1.5, "text": "..."}, ...]
+        }
+        with segments from all channels interleaved by start time.
+    """
+    if not os.path.exists(audio_path):
+        raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
+    try:
+        channels = audio.load_channels(audio_path)
     except Exception as e:
-        raise RuntimeError(f"Transcription failed: {e}")
+        raise RuntimeError(f"Failed to decode audio: {e}")
+
+    with _pinned_instance() as instance:
+        try:
+            with instance.lock, _suppress_output():
+                result = instance.model.transcribe(
+                    channels, verbose=False, batch_size=len(channels), timestamps=True
+                )
+        except Exception as e:
+            raise RuntimeError(f"Transcription failed: {e}")
+
+    # Older RNNT APIs return (best_hypotheses, all_hypotheses)
+    if isinstance(result, tuple):
+        result = result[0]
+
+    texts = []
+    segments = []
+    for channel, hypothesis in enumerate(result):
+        texts.append({'channel': channel, 'text': getattr(hypothesis, 'text', str(hypothesis))})
+
+        timestamp = getattr(hypothesis, 'timestamp', None) or {}
+        for segment in timestamp.get('segment', []):
+            segments.append({
+                'channel': channel,
+                'start': round(float(segment['start']), 3),
+                'end': round(float(segment['end']), 3),
+                'text': segment['segment'],
+            })
+
+    segments.sort(key=lambda s: (s['start'], s['channel']))
+    return {'channels': texts, 'segments': segments}
 
 
 def get_device() -> str:
     """Get current device name."""
-    return _device or "Unknown"
+    return _current.device if _current else "Unknown"
 
 
 def is_loaded() -> bool:
     """Check if model is loaded and ready."""
-    return _model is not None
+    return _current is not None
+
+
+def health_fields() -> dict[str, str]:
+    """
+    Model ids for health reporting.
+
+    - model:     instance serving new requests
+    - reloading: instance being loaded in the background
+    - draining:  previous instance finishing in-flight requests
+    """
+    fields = {}
+    with _state:
+        if _current is not None:
+            fields['model'] = _current.model_id
+        if _draining is not None:
+            fields['draining'] = _draining.model_id
+    if _reloading_id is not None:
+        fields['reloading'] = _reloading_id
+    return fields
@@ -0,0 +1,142 @@
+"""
+On-demand server startup - spawns the server from a client and waits until it is ready.
+
+Protocol:
+- Clients serialize spawning with an exclusive lock on <socket>.lock, so
+  concurrent clients start at most one server.
+- The spawner passes the write end of a pipe via PINK_TRANSCRIBER_READY_FD.
+  The server writes one line to it once the model is loaded (notify_ready).
+  If the server dies first, the pipe closes and the client fails fast.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import select
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# Environment variable carrying the readiness pipe fd to the server
+READY_FD_ENV = 'PINK_TRANSCRIBER_READY_FD'
+
+# Max time to wait for a spawned server (first run downloads the model)
+DEFAULT_READY_TIMEOUT = 900.0
+
+
+def _server_alive(socket_path: Path) -> bool:
+    """Check whether a server accepts connections on socket_path."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(2)
+        sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def _server_command() -> list[str]:
+    """Server command: installed entry point, or this interpreter as fallback."""
+    executable = shutil.which('pink-transcriber-server')
+    if executable:
+        return [executable]
+    return [sys.executable, '-m', 'pink_transcriber.cli.server']
+
+
+def _wait_ready(read_fd: int, proc: subprocess.Popen, timeout: float) -> None:
+    """Block until the server signals readiness, exits, or timeout expires."""
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Server not ready after {timeout:.0f}s")
+
+        readable, _, _ = select.select([read_fd], [], [], remaining)
+        if not readable:
+            continue
+
+        if os.read(read_fd, 64):
+            return
+
+        # EOF: server closed the pipe without signalling (it exited)
+        code = proc.wait()
+        raise RuntimeError(f"Server exited during startup (code {code})")
+
+
+def ensure_server(
+    socket_path: Path,
+    idle_exit: Optional[float] = None,
+    ready_timeout: float = DEFAULT_READY_TIMEOUT,
+) -> bool:
+    """
+    Start the server in the background unless one is already listening.
+
+    Args:
+        socket_path: Socket the server should listen on
+        idle_exit: Ask the spawned server to exit after this many idle seconds
+        ready_timeout: Max seconds to wait for the model to load
+
+    Returns:
+        True if this call spawned the server, False if one was already running
+    """
+    if _server_alive(socket_path):
+        return False
+
+    lock_path = socket_path.with_suffix('.lock')
+    with open(lock_path, 'w') as lock:
+        # Blocks while another client is spawning; it releases once ready
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        if _server_alive(socket_path):
+            return False
+
+        read_fd, write_fd = os.pipe()
+        env = dict(os.environ)
+        env[READY_FD_ENV] = str(write_fd)
+        env['PINK_TRANSCRIBER_SOCKET'] = str(socket_path)
+        if idle_exit is not None:
+            env['PINK_TRANSCRIBER_IDLE_EXIT'] = str(idle_exit)
+
+        log_path = socket_path.with_suffix('.log')
+        try:
+            with open(log_path, 'ab') as log:
+                proc = subprocess.Popen(
+                    _server_command(),
+                    env=env,
+                    stdin=subprocess.DEVNULL,
+                    stdout=log,
+                    stderr=log,
+                    pass_fds=(write_fd,),
+                    start_new_session=True,
+                )
+        finally:
+            os.close(write_fd)
+
+        try:
+            _wait_ready(read_fd, proc, ready_timeout)
+        except RuntimeError as e:
+            raise RuntimeError(f"{e} - see {log_path}") from e
+        finally:
+            os.close(read_fd)
+
+        return True
+
+
+def notify_ready() -> None:
+    """Signal readiness to the spawning client, if any (server side)."""
+    fd = os.environ.pop(READY_FD_ENV, None)
+    if fd is None:
+        return
+
+    try:
+        os.write(int(fd), b"READY\n")
+        os.close(int(fd))
+    except (OSError, ValueError):
+        pass
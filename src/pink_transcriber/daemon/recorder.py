@@ -0,0 +1,116 @@
+"""
+Request recording - anonymised traffic log for later replay.
+
+Each completed request is appended to a JSONL file as one compact record:
+
+    {"t": 12.345, "dur": 4.2, "sr": 48000, "ch": 1, "fmt": ".ogg", "size": 33012,
+     "wait": 0.01, "svc": 0.31, "ok": true}
+
+- t:    arrival time (unix timestamp)
+- dur:  audio duration in seconds (null if the format can't be probed)
+- sr:   sample rate (null if the format can't be probed)
+- ch:   channel count (null if the format can't be probed)
+- fmt:  file extension
+- size: file size in bytes
+- wait: time spent in queue (seconds)
+- svc:  transcription service time (seconds)
+- ok:   whether transcription succeeded
+
+No paths or transcripts are stored.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+def probe(audio_path: str) -> tuple[Optional[float], Optional[int], Optional[int]]:
+    """Get (duration, sample_rate, channels) without decoding, or Nones if unknown."""
+    try:
+        import soundfile
+        info = soundfile.info(audio_path)
+        return info.duration, info.samplerate, info.channels
+    except Exception:
+        return None, None, None
+
+
+class RequestRecorder:
+    """Append-only JSONL writer for request records (thread-safe)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, 'a', buffering=1)
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        audio_path: str,
+        arrived_at: float,
+        queue_wait: float,
+        service_time: float,
+        ok: bool,
+    ) -> None:
+        """
+        Write one record. Blocking (probes the file) - call from executor.
+
+        Args:
+            audio_path: Audio file (used only to derive duration, format, size)
+            arrived_at: time.time() when the request arrived
+            queue_wait: Seconds between arrival and start of transcription
+            service_time: Seconds spent transcribing
+            ok: Whether transcription succeeded
+        """
+        try:
+            size = os.path.getsize(audio_path)
+        except OSError:
+            size = None
+
+        duration, sample_rate, channels = probe(audio_path)
+
+        entry = {
+            't': round(arrived_at, 3),
+            'dur': round(duration, 3) if duration is not None else None,
+            'sr': sample_rate,
+            'ch': channels,
+            'fmt': os.path.splitext(audio_path)[1].lower(),
+            'size': size,
+            'wait': round(queue_wait, 4),
+            'svc': round(service_time, 4),
+            'ok': ok,
+        }
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+
+        with self._lock:
+            # Jobs still running at shutdown are dropped
+            if not self._file.closed:
+                self._file.write(line)
+
+    def close(self) -> None:
+        """Flush and close the log file."""
+        with self._lock:
+            self._file.close()
+
+
+def read_records(path: Path) -> list[dict]:
+    """
+    Read records from a recording, sorted by arrival time.
+
+    Arrival times are rebased so the first record arrives at t=0.
+    """
+    records = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    records.sort(key=lambda r: r['t'])
+    if records:
+        origin = records[0]['t']
+        for r in records:
+            r['t'] -= origin
+    return records
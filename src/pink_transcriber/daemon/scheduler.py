@@ -0,0 +1,235 @@
+"""
+Weighted fair queuing across tenants (clients sharing one server).
+
+Each request gets a virtual finish tag:
+
+    start  = max(virtual_time, tenant.last_finish)
+    finish = start + 1 / tenant.weight
+
+and the request with the smallest finish tag among eligible tenants is
+served next. A tenant with weight 4 gets ~4x the share of a weight-1
+tenant while both are backlogged; an idle tenant's first request jumps
+ahead of any bulk backlog. Tenants at their concurrency cap are skipped
+until one of their requests finishes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+# Tenant used when a request carries no id and peer credentials are unavailable
+DEFAULT_TENANT = 'default'
+
+# Latency samples kept per tenant for percentiles
+LATENCY_WINDOW = 1000
+
+# Distinct tenants tracked at once (configured tenants don't count against
+# it): past this, the least recently seen idle tenant is evicted, or the
+# request is folded into DEFAULT_TENANT if none is idle
+MAX_TENANTS = 64
+
+
+class QueueClosed(RuntimeError):
+    """Raised by put() once the queue is closed (server shutting down)."""
+
+
+@dataclass
+class _Tenant:
+    """Per-tenant queue and counters."""
+    weight: float
+    cap: Optional[int]
+    queue: deque = field(default_factory=deque)
+    last_finish: float = 0.0
+    running: int = 0
+    last_seen: float = 0.0
+    completed: int = 0
+    failed: int = 0
+    waits: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+
+def _percentile(values: deque, pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return round(ordered[index], 4)
+
+
+class FairQueue:
+    """
+    Drop-in replacement for asyncio.Queue with per-tenant WFQ.
+
+    Requests need `tenant` and `arrived_at` attributes. Workers must call
+    task_done(request, ok) when done so caps and metrics stay accurate.
+    put(None) makes one get() return None (worker stop sentinel) once
+    no request is left queued. After close(), put() raises QueueClosed.
+
+    Args:
+        weights: Tenant -> weight (default 1.0; '*' sets the default)
+        caps: Tenant -> max requests in service at once ('*' sets the default)
+    """
+
+    def __init__(
+        self,
+        weights: Optional[dict[str, float]] = None,
+        caps: Optional[dict[str, int]] = None,
+    ) -> None:
+        self._weights = dict(weights or {})
+        self._caps = dict(caps or {})
+        self._tenants: dict[str, _Tenant] = {}
+        self._virtual_time = 0.0
+        self._stop_requests = 0
+        self._ready = asyncio.Condition()
+        self.closed = False
+        self.last_activity = time.time()
+
+    def _tenant(self, name: str) -> _Tenant:
+        tenant = self._tenants.get(name)
+        if tenant is None:
+            weight = self._weights.get(name, self._weights.get('*', 1.0))
+            cap = self._caps.get(name, self._caps.get('*'))
+            tenant = self._tenants[name] = _Tenant(weight=max(weight, 1e-6), cap=cap)
+        return tenant
+
+    def _configured(self, name: str) -> bool:
+        return name in self._weights or name in self._caps
+
+    def _admit(self, name: str) -> str:
+        """Tenant name to queue a request under, keeping the table bounded."""
+        if name in self._tenants or name == DEFAULT_TENANT or self._configured(name):
+            return name
+
+        dynamic = [
+            other for other in self._tenants
+            if other != DEFAULT_TENANT and not self._configured(other)
+        ]
+        if len(dynamic) < MAX_TENANTS:
+            return name
+
+        idle = [
+            other for other in dynamic
+            if not self._tenants[other].queue and not self._tenants[other].running
+        ]
+        if not idle:
+            return DEFAULT_TENANT
+
+        del self._tenants[min(idle, key=lambda other: self._tenants[other].last_seen)]
+        return name
+
+    def _pick(self) -> Optional[Any]:
+        """Pop the eligible request with the smallest finish tag."""
+        best: Optional[_Tenant] = None
+        for tenant in self._tenants.values():
+            if not tenant.queue:
+                continue
+            if tenant.cap is not None and tenant.running >= tenant.cap:
+                continue
+            if best is None or tenant.queue[0][1] < best.queue[0][1]:
+                best = tenant
+
+        if best is None:
+            return None
+
+        start, _, request = best.queue.popleft()
+        self._virtual_time = max(self._virtual_time, start)
+        best.running += 1
+        return request
+
+    async def put(self, request: Any) -> None:
+        """Enqueue request (or None to stop one worker)."""
+        async with self._ready:
+            if request is not None and self.closed:
+                raise QueueClosed("Server shutting down")
+            if request is None:
+                self._stop_requests += 1
+            else:
+                request.tenant = self._admit(request.tenant)
+                tenant = self._tenant(request.tenant)
+                start = max(self._virtual_time, tenant.last_finish)
+                finish = start + 1.0 / tenant.weight
+                tenant.last_finish = finish
+                tenant.queue.append((start, finish, request))
+                tenant.last_seen = self.last_activity = time.time()
+            self._ready.notify_all()
+
+    async def get(self) -> Any:
+        """Wait for the next request to serve (None = stop, after queued work)."""
+        async with self._ready:
+            while True:
+                request = self._pick()
+                if request is not None:
+                    request.started_at = time.time()
+                    return request
+                # Capped tenants may still have requests waiting for a slot
+                if self._stop_requests and not any(t.queue for t in self._tenants.values()):
+                    self._stop_requests -= 1
+                    return None
+                await self._ready.wait()
+
+    async def drain(self) -> list[Any]:
+        """Remove and return all queued (not yet started) requests."""
+        async with self._ready:
+            requests = [request for t in self._tenants.values() for _, _, request in t.queue]
+            for tenant in self._tenants.values():
+                tenant.queue.clear()
+            return requests
+
+    async def task_done(self, request: Any, ok: bool = True) -> None:
+        """Mark request finished: frees its tenant's slot and records latency."""
+        async with self._ready:
+            tenant = self._tenant(request.tenant)
+            tenant.running -= 1
+            if ok:
+                tenant.completed += 1
+            else:
+                tenant.failed += 1
+
+            now = time.time()
+            tenant.waits.append(request.started_at - request.arrived_at)
+            tenant.latencies.append(now - request.arrived_at)
+            self.last_activity = now
+            self._ready.notify_all()
+
+    def close(self) -> None:
+        """Reject further requests; already queued ones are still served."""
+        self.closed = True
+
+    def close_if_idle(self, idle_for: float) -> bool:
+        """
+        Close the queue if nothing was queued or running for idle_for seconds.
+
+        Check and close happen without yielding to the event loop, so no
+        request can slip in between.
+        """
+        if self.closed or self.pending() or time.time() - self.last_activity < idle_for:
+            return False
+        self.close()
+        return True
+
+    def pending(self) -> int:
+        """Requests queued or in service across all tenants."""
+        return sum(len(t.queue) + t.running for t in self._tenants.values())
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-tenant queue depth, counters and wait/latency percentiles (seconds)."""
+        return {
+            name: {
+                'weight': tenant.weight,
+                'cap': tenant.cap,
+                'queued': len(tenant.queue),
+                'running': tenant.running,
+                'completed': tenant.completed,
+                'failed': tenant.failed,
+                'wait_p50': _percentile(tenant.waits, 50),
+                'wait_p95': _percentile(tenant.waits, 95),
+                'latency_p50': _percentile(tenant.latencies, 50),
+                'latency_p95': _percentile(tenant.latencies, 95),
+            }
+            for name, tenant in self._tenants.items()
+        }
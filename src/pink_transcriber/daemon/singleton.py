@@ -4,20 +4,32 @@ Single instance enforcement - ensures only one instance of the process runs.
 
 import sys
 import os
+from pathlib import Path
+
 import psutil
 
-from pink_transcriber.config import VERBOSE_MODE, SINGLETON_IDENTIFIERS
+from pink_transcriber.config import VERBOSE_MODE, SINGLETON_IDENTIFIERS, DEFAULT_SOCKET_PATH, SOCKET_PATH
+
+
+def _is_session_leader(pid: int) -> bool:
+    try:
+        return os.getsid(pid) == pid
+    except OSError:
+        return False
 
 
 def _find_root_process(proc: psutil.Process, excluded_pids: list[int]) -> psutil.Process:
     """
     Find root process (topmost non-system parent).
 
-    Walks up the process tree until reaching system process or excluded PID.
+    Walks up the process tree until reaching system process, excluded PID
+    or a session leader. Session leaders are never climbed past or into:
+    a server spawned by a client (own session) is its own root, and the
+    user's shell/tmux above a wrapper chain is left alone.
     """
     root = proc
     try:
-        while root.parent():
+        while root.parent() and not _is_session_leader(root.pid):
             parent = root.parent()
 
             # Stop if parent is excluded (our own parent chain)
@@ -28,6 +40,10 @@ def _find_root_process(proc: psutil.Process, excluded_pids: list[int]) -> psutil
             if parent.pid <= 1000:
                 break
 
+            # Stop below a session leader (shell, terminal, tmux)
+            if _is_session_leader(parent.pid):
+                break
+
             root = parent
     except (psutil.NoSuchProcess, psutil.AccessDenied):
         pass
@@ -35,6 +51,19 @@ def _find_root_process(proc: psutil.Process, excluded_pids: list[int]) -> psutil
     return root
 
 
+def _serves_socket(proc: psutil.Process, socket_path: Path) -> bool:
+    """
+    Check whether proc serves socket_path (PINK_TRANSCRIBER_SOCKET in its env).
+
+    Processes whose environment can't be read are assumed to use the default.
+    """
+    try:
+        path = proc.environ().get('PINK_TRANSCRIBER_SOCKET', DEFAULT_SOCKET_PATH)
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        path = DEFAULT_SOCKET_PATH
+    return Path(path) == socket_path
+
+
 def _kill_process_tree(root: psutil.Process, verbose: bool) -> int:
     """Kill process and all its children recursively."""
     killed = 0
@@ -78,6 +107,7 @@ def ensure_single_instance(process_name: str) -> None:
 
     Strategy:
     - Find all Python processes with target modules in cmdline
+    - Keep those serving a different socket (separate instances)
     - For each found process: climb to root of process tree
     - Kill entire tree from root (handles wrappers like caffeinate/uv)
     - Works regardless of how process was launched
@@ -122,6 +152,11 @@ def ensure_single_instance(process_name: str) -> None:
             # Check if any project identifier in cmdline
             for identifier in SINGLETON_IDENTIFIERS:
                 if identifier in cmdline:
+                    if not _serves_socket(proc, SOCKET_PATH):
+                        if VERBOSE_MODE:
+                            print(f"[Singleton] Skipping PID {proc.info['pid']} (other socket): {cmdline}")
+                        break
+
                     if VERBOSE_MODE:
                         print(f"[Singleton] Found target process PID {proc.info['pid']}: {cmdline}")
 
@@ -5,12 +5,24 @@ Worker for handling transcription requests.
 from __future__ import annotations
 
 import asyncio
+import json
+import socket
+import struct
+import sys
 import time
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any, Optional
 
 from pink_transcriber.config import VERBOSE_MODE
 from pink_transcriber.core import model
+from pink_transcriber.daemon.recorder import RequestRecorder
+from pink_transcriber.daemon.scheduler import DEFAULT_TENANT, FairQueue, QueueClosed
+
+# macOS: getsockopt(SOL_LOCAL, LOCAL_PEERCRED) returns struct xucred
+_SOL_LOCAL = 0
+_LOCAL_PEERCRED = 0x001
+_XUCRED_SIZE = 76
 
 
 @dataclass
@@ -18,9 +30,16 @@ class TranscriptionRequest:
     """Request for transcription."""
     audio_path: str
     result_future: asyncio.Future
+    arrived_at: float = field(default_factory=time.time)
+    split_channels: bool = False
+    tenant: str = DEFAULT_TENANT
+    started_at: float = 0.0
 
 
-async def transcription_worker(queue: asyncio.Queue[TranscriptionRequest]) -> None:
+async def transcription_worker(
+    queue: FairQueue,
+    recorder: Optional[RequestRecorder] = None
+) -> None:
     """Process transcription requests from queue sequentially."""
     while True:
         try:
@@ -30,17 +49,43 @@ async def transcription_worker(queue: asyncio.Queue[TranscriptionRequest]) -> No
             if request is None:
                 break
 
+            loop = asyncio.get_event_loop()
+            ok = False
+
             try:
                 # Run transcription in executor (blocking operation)
-                loop = asyncio.get_event_loop()
-                text = await loop.run_in_executor(None, model.transcribe, request.audio_path)
-                request.result_future.set_result(text)
+                transcribe = model.transcribe_channels if request.split_channels else model.transcribe
+                result = await loop.run_in_executor(None, transcribe, request.audio_path)
+                ok = True
+                if not request.result_future.done():
+                    request.result_future.set_result(result)
 
             except Exception as e:
-                request.result_future.set_exception(e)
+                if not request.result_future.done():
+                    request.result_future.set_exception(e)
+
+            except asyncio.CancelledError:
+                # Stopped at shutdown: still answer the client
+                if not request.result_future.done():
+                    request.result_future.set_exception(RuntimeError("Server shutting down"))
+                raise
 
             finally:
-                queue.task_done()
+                await queue.task_done(request, ok)
+
+            if recorder is not None:
+                # Fire and forget: probing the file must not delay the next get()
+                finished_at = time.time()
+                job = loop.run_in_executor(
+                    None,
+                    recorder.record,
+                    request.audio_path,
+                    request.arrived_at,
+                    request.started_at - request.arrived_at,
+                    finished_at - request.started_at,
+                    ok,
+                )
+                job.add_done_callback(_log_record_failure)
 
         except asyncio.CancelledError:
             break
@@ -48,91 +93,216 @@ async def transcription_worker(queue: asyncio.Queue[TranscriptionRequest]) -> No
             pass
 
 
+def _log_record_failure(job: asyncio.Future) -> None:
+    """Done callback for recorder jobs (also retrieves the exception)."""
+    if job.cancelled():
+        return
+    error = job.exception()
+    if error is not None and VERBOSE_MODE:
+        print(f"✗ Failed to record request: {error}", flush=True)
+
+
+def peer_tenant(sock: Any) -> str:
+    """Tenant id from Unix socket peer credentials ('uid:<n>'), or DEFAULT_TENANT."""
+    try:
+        if hasattr(socket, 'SO_PEERCRED'):
+            # Linux: struct ucred {pid, uid, gid}
+            creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+            _, uid, _ = struct.unpack('3i', creds)
+        elif sys.platform == 'darwin':
+            # macOS: struct xucred {cr_version, cr_uid, ...}
+            creds = sock.getsockopt(_SOL_LOCAL, _LOCAL_PEERCRED, _XUCRED_SIZE)
+            _, uid = struct.unpack_from('2I', creds)
+        else:
+            return DEFAULT_TENANT
+        return f"uid:{uid}"
+    except (OSError, struct.error):
+        return DEFAULT_TENANT
+
+
+async def _read_line(reader: asyncio.StreamReader, closing: Optional[asyncio.Event]) -> bytes:
+    """readline() that returns b'' (as on EOF) once closing is set."""
+    if closing is None:
+        return await reader.readline()
+    if closing.is_set():
+        return b''
+
+    read = asyncio.ensure_future(reader.readline())
+    stop = asyncio.ensure_future(closing.wait())
+    try:
+        done, _ = await asyncio.wait({read, stop}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stop.cancel()
+        if not read.done():
+            read.cancel()
+
+    return read.result() if read in done else b''
+
+
 async def handle_client(
     reader: asyncio.StreamReader,
     writer: asyncio.StreamWriter,
-    queue: asyncio.Queue[TranscriptionRequest]
+    queue: FairQueue,
+    closing: Optional[asyncio.Event] = None
 ) -> None:
-    """Handle incoming client connection."""
-    start_time = time.time() if VERBOSE_MODE else None
+    """
+    Handle incoming client connection.
+
+    Connections are persistent: the client may send any number of
+    newline-terminated requests, each answered with one response line,
+    until it closes the connection. Once closing is set, the connection
+    is closed as soon as it is idle (a request in progress still gets
+    its response).
+    """
+    default_tenant = peer_tenant(writer.get_extra_info('socket'))
 
     try:
-        # Read command or audio file path from client
-        data = await reader.readline()
-        message = data.decode().strip()
-
-        # Handle health check command
-        if message == "HEALTH":
-            if model.is_loaded():
-                writer.write(b"OK\n")
-            else:
-                writer.write(b"LOADING\n")
-            await writer.drain()
-            writer.close()
-            await writer.wait_closed()
-            return
+        while True:
+            # Read command or audio file path from client
+            data = await _read_line(reader, closing)
+            if not data:
+                break
 
-        # Regular transcription request
-        audio_path = message
+            try:
+                response = await handle_message(data.decode().strip(), queue, default_tenant)
+            except QueueClosed:
+                # Shutting down: close without answering so the client retries
+                # the request elsewhere (e.g. on a freshly spawned server)
+                break
 
-        if not audio_path:
-            error_msg = f"ERROR: No audio path provided\n".encode()
-            writer.write(error_msg)
+            # One line per response (error messages may contain newlines)
+            writer.write(response.replace('\n', ' ').encode() + b'\n')
             await writer.drain()
+
+    except (BrokenPipeError, ConnectionResetError):
+        # Client disconnected - this is normal (e.g., healthcheck)
+        pass
+
+    finally:
+        try:
             writer.close()
             await writer.wait_closed()
-            return
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def health_response() -> str:
+    """Build health line: 'OK|LOADING key=value ...' (model ids, reload state)."""
+    status = "OK" if model.is_loaded() else "LOADING"
+    fields = ''.join(f" {key}={value}" for key, value in model.health_fields().items())
+    return status + fields
+
+
+async def reload(model_name: Optional[str] = None, device: Optional[str] = None) -> str:
+    """Reload model in background; current model keeps serving until the switch."""
+    if not model.is_loaded():
+        return "ERROR: Model is loading"
+
+    if VERBOSE_MODE:
+        print(f"↻ Reloading model ({model_name or 'current'}, {device or 'default device'})...", flush=True)
+
+    try:
+        loop = asyncio.get_event_loop()
+        model_id = await loop.run_in_executor(None, model.reload_model, model_name, device)
+        return f"OK model={model_id}"
 
+    except Exception as e:
         if VERBOSE_MODE:
-            filename = Path(audio_path).name
-            print(f"→ Received request: {filename}", flush=True)
+            print(f"✗ Reload failed: {str(e)}", flush=True)
+        return f"ERROR: Reload failed: {str(e)}"
+
+
+def parse_request(message: str) -> tuple[str, dict]:
+    """
+    Split a transcription request into audio path and options.
+
+    Accepts either a bare path or a JSON object:
+        {"path": "/abs/file.wav", "channels": true, "tenant": "batch"}
+    """
+    if not message.startswith('{'):
+        return message, {}
+
+    try:
+        options = json.loads(message)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON request: {e}")
+
+    if not isinstance(options, dict):
+        raise ValueError("Invalid JSON request: expected object")
+
+    return str(options.pop('path', '') or ''), options
+
+
+async def handle_message(
+    message: str,
+    queue: FairQueue,
+    default_tenant: str = DEFAULT_TENANT
+) -> str:
+    """Process one request line and return the response line (without newline)."""
+    start_time = time.time() if VERBOSE_MODE else None
+
+    # Handle health check command
+    if message == "HEALTH":
+        return health_response()
+
+    # Per-tenant scheduler metrics
+    if message == "STATS":
+        return json.dumps({'pending': queue.pending(), 'tenants': queue.stats()})
+
+    # Hot model reload: RELOAD [model_name] [device]
+    if message == "RELOAD" or message.startswith("RELOAD "):
+        return await reload(*message.split()[1:3])
+
+    # Regular transcription request: plain path or JSON object with options
+    try:
+        audio_path, options = parse_request(message)
+    except ValueError as e:
+        return f"ERROR: {str(e)}"
+
+    if not audio_path:
+        return "ERROR: No audio path provided"
+
+    split_channels = bool(options.get('channels'))
+    tenant = str(options.get('tenant') or default_tenant)
 
+    if VERBOSE_MODE:
+        filename = Path(audio_path).name
+        print(f"→ Received request: {filename} (tenant: {tenant})", flush=True)
+
+    try:
         # Create future for result
         result_future = asyncio.Future()
 
         # Add to queue
-        request = TranscriptionRequest(audio_path=audio_path, result_future=result_future)
+        request = TranscriptionRequest(
+            audio_path=audio_path,
+            result_future=result_future,
+            split_channels=split_channels,
+            tenant=tenant,
+        )
         await queue.put(request)
 
         # Wait for result from worker
-        text = await result_future
+        result = await result_future
+
+        # Per-channel results are returned as one JSON line
+        text = json.dumps(result, ensure_ascii=False) if split_channels else result
 
         if VERBOSE_MODE:
             elapsed = time.time() - start_time
             print(f"✓ Transcribed in {elapsed:.2f}s: {text[:50]}...", flush=True)
 
-        # Send result back to client
-        response = text.encode() + b'\n'
-        writer.write(response)
-        await writer.drain()
+        return text
 
-    except (BrokenPipeError, ConnectionResetError):
-        # Client disconnected - this is normal (e.g., healthcheck)
-        pass
+    except QueueClosed:
+        raise
 
     except FileNotFoundError as e:
         if VERBOSE_MODE:
             print(f"✗ File not found: {str(e)}", flush=True)
-        try:
-            error_msg = f"ERROR: {str(e)}\n".encode()
-            writer.write(error_msg)
-            await writer.drain()
-        except (BrokenPipeError, ConnectionResetError):
-            pass
+        return f"ERROR: {str(e)}"
 
     except Exception as e:
         if VERBOSE_MODE:
             print(f"✗ Error: {str(e)}", flush=True)
-        try:
-            error_msg = f"ERROR: {str(e)}\n".encode()
-            writer.write(error_msg)
-            await writer.drain()
-        except (BrokenPipeError, ConnectionResetError):
-            pass
-
-    finally:
-        try:
-            writer.close()
-            await writer.wait_closed()
-        except (BrokenPipeError, ConnectionResetError):
-            pass
+        return f"ERROR: {str(e)}"